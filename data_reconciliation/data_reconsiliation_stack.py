@@ -114,7 +114,12 @@ class ReconciliationStack(Stack):
                                                  expiration=aws_cdk.Duration.days(2),
                                              )
                                          ])
-        parsing_lambda = self._create_parsing_lambda()
+        # Each table runs up to column_group_concurrency group queries and the table Map runs 10 tables
+        # at once, so their product has to stay within the Athena active DML query quota (20 by default)
+        column_group_size = 50
+        column_group_concurrency = 2
+        parsing_lambda = self._create_parsing_lambda(column_group_size)
+        self._grant_query_results_access(parsing_lambda, athena_result_bucket)
         step_function_role = self._create_sf_role(parsing_lambda.function_arn, athena_result_bucket.bucket_name)
         source_bucket = self.bucket_name
         bucket_prefix = "bucket_prefix"
@@ -127,12 +132,13 @@ class ReconciliationStack(Stack):
                 step_function_config.build_reconciliation_step_function(source_bucket, bucket_prefix,
                                                                         athena_result_bucket.bucket_name,
                                                                         parsing_lambda.function_arn, names[0],
-                                                                        athena_datasource_name, names[1]
+                                                                        athena_datasource_name, names[1],
+                                                                        column_group_concurrency
                                                                         ))
         )
         return state_machine
 
-    def _create_parsing_lambda(self) -> aws_lambda.Function:
+    def _create_parsing_lambda(self, column_group_size: int) -> aws_lambda.Function:
         lambda_role = self._create_parsing_lambda_role()
         return aws_lambda.Function(
             self,
@@ -142,9 +148,21 @@ class ReconciliationStack(Stack):
             code=aws_lambda.Code.from_asset(os.path.join(dirname, 'handler')),
             role=lambda_role,
             timeout=aws_cdk.Duration.seconds(30),
-            environment={'threshold': '5'}
+            environment={'threshold': '5', 'column_group_size': str(column_group_size)}
         )
 
+    def _grant_query_results_access(self, parsing_lambda: aws_lambda.Function, athena_result_bucket: s3.Bucket):
+        # ParseColumns pages through the column lookup results of wide tables itself
+        account_id = Fn.ref("AWS::AccountId")
+        athena_result_bucket.grant_read(parsing_lambda)
+        parsing_lambda.add_to_role_policy(iam.PolicyStatement(
+            resources=[f"arn:aws:athena:ap-southeast-2:{account_id}:workgroup/primary"],
+            effect=iam.Effect.ALLOW,
+            actions=[
+                "athena:getQueryResults"
+            ]
+        ))
+
     def _create_parsing_lambda_role(self) -> iam.Role:
         return iam.Role(
             self,
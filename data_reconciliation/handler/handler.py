@@ -2,10 +2,58 @@ import json
 import boto3
 import os
 
+DEFAULT_COLUMN_GROUP_SIZE = 50
+
+
 def lambda_handler(event, context):
     columns = []
-    for data_row in event['QueryResult']['ResultSet']['Rows']:
+    primary_key = []
+    for data_row in _read_rows(event):
         if data_row['Data'][0]['VarCharValue'] != 'column_name':
-            columns.append(data_row['Data'][0]['VarCharValue'])
-    columns_string = ','.join(columns)
-    return columns_string
\ No newline at end of file
+            column = data_row['Data'][0]['VarCharValue']
+            columns.append(column)
+            if len(data_row['Data']) > 1 and data_row['Data'][1].get('VarCharValue') == '1':
+                primary_key.append(column)
+    return {
+        "column_groups": build_column_groups(columns, primary_key, _column_group_size())
+    }
+
+
+def _read_rows(event):
+    # The state machine only fetches the first page of the column lookup, so
+    # tables wider than a page are completed here by following NextToken.
+    query_result = event['QueryResult']
+    rows = list(query_result['ResultSet']['Rows'])
+    next_token = query_result.get('NextToken')
+    if next_token:
+        athena = boto3.client('athena')
+        while next_token:
+            page = athena.get_query_results(
+                QueryExecutionId=event['QueryExecutionId'],
+                NextToken=next_token,
+                MaxResults=1000
+            )
+            rows.extend(page['ResultSet']['Rows'])
+            next_token = page.get('NextToken')
+    return rows
+
+
+def _column_group_size():
+    group_size = int(os.environ.get('column_group_size', DEFAULT_COLUMN_GROUP_SIZE))
+    if group_size < 1:
+        raise ValueError(f"column_group_size must be at least 1, got {group_size}")
+    return group_size
+
+
+def build_column_groups(columns, primary_key, group_size):
+    # Every group carries the primary key so that a row can still be matched
+    # between source and target when only a slice of its columns is compared.
+    # Without a primary key the rows can't be aligned, so the table is compared
+    # as a single group.
+    other_columns = [column for column in columns if column not in primary_key]
+    if not primary_key or len(other_columns) <= group_size:
+        return [{"columns": ','.join(columns)}]
+    return [
+        {"columns": ','.join(primary_key + other_columns[i:i + group_size])}
+        for i in range(0, len(other_columns), group_size)
+    ]
@@ -1,4 +1,5 @@
-def build_reconciliation_step_function(bucket_name, bucket_prefix, result_bucket, lambda_arn, crawler_name, athena_datasource_name, catalog_db_name):
+def build_reconciliation_step_function(bucket_name, bucket_prefix, result_bucket, lambda_arn, crawler_name, athena_datasource_name, catalog_db_name,
+                                        column_group_concurrency):
     return {
         "Comment": "Reconciliation state machine",
         "StartAt": "StartCrawler",
@@ -81,12 +82,22 @@ def build_reconciliation_step_function(bucket_name, bucket_prefix, result_bucket
                             "Type": "Task",
                             "Resource": "arn:aws:states:::athena:startQueryExecution",
                             "Parameters": {
-                                "QueryString.$": "States.Format('Select column_name from \"{}\".\"sys\".\"all_tab_columns\" where table_name = {}{}{} and owner = test',$.Athena_Datasource_Name,$.Quote,$.Name,$.Quote,$.Quote,$.Quote)",
+                                "QueryString.$": "States.Format('Select c.column_name, case when p.column_name is null then 0 else 1 end as is_pk from \"{}\".\"sys\".\"all_tab_columns\" c left join (select cc.column_name from \"{}\".\"sys\".\"all_cons_columns\" cc join \"{}\".\"sys\".\"all_constraints\" k on cc.owner = k.owner and cc.constraint_name = k.constraint_name where k.constraint_type = {}P{} and k.table_name = {}{}{} and k.owner = {}test{} and cc.owner = {}test{} and cc.table_name = {}{}{}) p on c.column_name = p.column_name where c.table_name = {}{}{} and c.owner = {}test{} order by c.column_id',$.Athena_Datasource_Name,$.Athena_Datasource_Name,$.Athena_Datasource_Name,$.Quote,$.Quote,$.Quote,$.Name,$.Quote,$.Quote,$.Quote,$.Quote,$.Quote,$.Quote,$.Name,$.Quote,$.Quote,$.Name,$.Quote,$.Quote,$.Quote)",
                                 "WorkGroup": "primary",
                                 "ResultConfiguration": {
                                     "OutputLocation": f"s3://{result_bucket}/athena-result/"
                                 }
                             },
+                            "Retry": [
+                                {
+                                    "ErrorEquals": [
+                                        "Athena.TooManyRequestsException"
+                                    ],
+                                    "IntervalSeconds": 30,
+                                    "MaxAttempts": 8,
+                                    "BackoffRate": 1.5
+                                }
+                            ],
                             "Next": "Athena GetQueryExecution",
                             "ResultPath": "$.Query1"
                         },
@@ -106,6 +117,19 @@ def build_reconciliation_step_function(bucket_name, bucket_prefix, result_bucket
                                     "Variable": "$.QueryExecution.QueryExecution.Status.State",
                                     "StringEquals": "SUCCEEDED",
                                     "Next": "Athena GetQueryResults"
+                                },
+                                {
+                                    "Or": [
+                                        {
+                                            "Variable": "$.QueryExecution.QueryExecution.Status.State",
+                                            "StringEquals": "FAILED"
+                                        },
+                                        {
+                                            "Variable": "$.QueryExecution.QueryExecution.Status.State",
+                                            "StringEquals": "CANCELLED"
+                                        }
+                                    ],
+                                    "Next": "Fail (1)"
                                 }
                             ],
                             "Default": "Wait"
@@ -119,7 +143,7 @@ def build_reconciliation_step_function(bucket_name, bucket_prefix, result_bucket
                             "Type": "Task",
                             "Resource": "arn:aws:states:::athena:getQueryResults",
                             "Parameters": {
-                                "MaxResults": 100,
+                                "MaxResults": 1000,
                                 "QueryExecutionId.$": "$.Query1.QueryExecutionId"
                             },
                             "Next": "ParseColumns",
@@ -129,7 +153,10 @@ def build_reconciliation_step_function(bucket_name, bucket_prefix, result_bucket
                             "Type": "Task",
                             "Resource": "arn:aws:states:::lambda:invoke",
                             "Parameters": {
-                                "Payload.$": "$",
+                                "Payload": {
+                                    "QueryExecutionId.$": "$.Query1.QueryExecutionId",
+                                    "QueryResult.$": "$.QueryResult"
+                                },
                                 "FunctionName": lambda_arn
                             },
                             "Retry": [
@@ -145,78 +172,128 @@ def build_reconciliation_step_function(bucket_name, bucket_prefix, result_bucket
                                     "BackoffRate": 2
                                 }
                             ],
-                            "Next": "Athena StartQueryExecution (1)",
+                            "Next": "Map (1)",
                             "ResultSelector": {
-                                "table_columns.$": "$.Payload"
+                                "column_groups.$": "$.Payload.column_groups"
                             },
                             "ResultPath": "$.LambdaTaskResult"
                         },
-                        "Athena StartQueryExecution (1)": {
-                            "Type": "Task",
-                            "Resource": "arn:aws:states:::athena:startQueryExecution",
-                            "Parameters": {
-                                "QueryString.$": "States.Format('Select {} from {} EXCEPT SELECT {} from \"AwsDataCatalog\".\"{}\".\"{}\"',$.LambdaTaskResult.table_columns, $.Athena_Datasource_Name, $.Name,$.LambdaTaskResult.table_columns,$.Catalog_Table_Name,$.Name)",
-                                "WorkGroup": "primary",
-                                "ResultConfiguration": {
-                                    "OutputLocation": f"s3://{result_bucket}/athena-result/"
+                        "Map (1)": {
+                            "Type": "Map",
+                            "ItemProcessor": {
+                                "ProcessorConfig": {
+                                    "Mode": "INLINE"
+                                },
+                                "StartAt": "Athena StartQueryExecution (1)",
+                                "States": {
+                                    "Athena StartQueryExecution (1)": {
+                                        "Type": "Task",
+                                        "Resource": "arn:aws:states:::athena:startQueryExecution",
+                                        "Parameters": {
+                                            "QueryString.$": "States.Format('Select {} from \"{}\".\"test\".\"{}\" EXCEPT SELECT {} from \"AwsDataCatalog\".\"{}\".\"{}\"',$.Columns, $.Athena_Datasource_Name, $.Name,$.Columns,$.Catalog_Table_Name,$.Name)",
+                                            "WorkGroup": "primary",
+                                            "ResultConfiguration": {
+                                                "OutputLocation": f"s3://{result_bucket}/athena-result/"
+                                            }
+                                        },
+                                        "Retry": [
+                                            {
+                                                "ErrorEquals": [
+                                                    "Athena.TooManyRequestsException"
+                                                ],
+                                                "IntervalSeconds": 30,
+                                                "MaxAttempts": 8,
+                                                "BackoffRate": 1.5
+                                            }
+                                        ],
+                                        "Next": "Athena GetQueryExecution (1)",
+                                        "ResultPath": "$.ComparisonResult"
+                                    },
+                                    "Athena GetQueryExecution (1)": {
+                                        "Type": "Task",
+                                        "Resource": "arn:aws:states:::athena:getQueryExecution",
+                                        "Parameters": {
+                                            "QueryExecutionId.$": "$.ComparisonResult.QueryExecutionId"
+                                        },
+                                        "Next": "Choice (2)",
+                                        "ResultPath": "$.QueryExecution"
+                                    },
+                                    "Choice (2)": {
+                                        "Type": "Choice",
+                                        "Choices": [
+                                            {
+                                                "Variable": "$.QueryExecution.QueryExecution.Status.State",
+                                                "StringEquals": "SUCCEEDED",
+                                                "Next": "Athena GetQueryResults (1)"
+                                            },
+                                            {
+                                                "Or": [
+                                                    {
+                                                        "Variable": "$.QueryExecution.QueryExecution.Status.State",
+                                                        "StringEquals": "FAILED"
+                                                    },
+                                                    {
+                                                        "Variable": "$.QueryExecution.QueryExecution.Status.State",
+                                                        "StringEquals": "CANCELLED"
+                                                    }
+                                                ],
+                                                "Next": "Fail"
+                                            }
+                                        ],
+                                        "Default": "Wait (1)"
+                                    },
+                                    "Wait (1)": {
+                                        "Type": "Wait",
+                                        "Seconds": 5,
+                                        "Next": "Athena GetQueryExecution (1)"
+                                    },
+                                    "Athena GetQueryResults (1)": {
+                                        "Type": "Task",
+                                        "Resource": "arn:aws:states:::athena:getQueryResults",
+                                        "Parameters": {
+                                            "MaxResults": 10,
+                                            "QueryExecutionId.$": "$.QueryExecution.QueryExecution.QueryExecutionId"
+                                        },
+                                        "Next": "Pass (1)"
+                                    },
+                                    "Pass (1)": {
+                                        "Type": "Pass",
+                                        "Next": "Choice (3)",
+                                        "Parameters": {
+                                            "ArrayLength.$": "States.ArrayLength($.ResultSet.Rows)"
+                                        }
+                                    },
+                                    "Choice (3)": {
+                                        "Type": "Choice",
+                                        "Choices": [
+                                            {
+                                                "Variable": "$.ArrayLength",
+                                                "NumericGreaterThan": 1,
+                                                "Next": "Fail"
+                                            }
+                                        ],
+                                        "Default": "Success (1)"
+                                    },
+                                    "Fail": {
+                                        "Type": "Fail"
+                                    },
+                                    "Success (1)": {
+                                        "Type": "Succeed"
+                                    }
                                 }
                             },
-                            "Next": "Athena GetQueryExecution (1)",
-                            "ResultPath": "$.ComparisonResult"
-                        },
-                        "Athena GetQueryExecution (1)": {
-                            "Type": "Task",
-                            "Resource": "arn:aws:states:::athena:getQueryExecution",
-                            "Parameters": {
-                                "QueryExecutionId.$": "$.ComparisonResult.QueryExecutionId"
+                            "Next": "Success",
+                            "ItemsPath": "$.LambdaTaskResult.column_groups",
+                            "ItemSelector": {
+                                "Columns.$": "$$.Map.Item.Value.columns",
+                                "Athena_Datasource_Name.$": "$.Athena_Datasource_Name",
+                                "Catalog_Table_Name.$": "$.Catalog_Table_Name",
+                                "Name.$": "$.Name"
                             },
-                            "Next": "Choice (2)",
-                            "ResultPath": "$.QueryExecution"
-                        },
-                        "Choice (2)": {
-                            "Type": "Choice",
-                            "Choices": [
-                                {
-                                    "Variable": "$.QueryExecution.QueryExecution.Status.State",
-                                    "StringEquals": "SUCCEEDED",
-                                    "Next": "Athena GetQueryResults (1)"
-                                }
-                            ],
-                            "Default": "Wait (1)"
-                        },
-                        "Wait (1)": {
-                            "Type": "Wait",
-                            "Seconds": 5,
-                            "Next": "Athena GetQueryExecution (1)"
-                        },
-                        "Athena GetQueryResults (1)": {
-                            "Type": "Task",
-                            "Resource": "arn:aws:states:::athena:getQueryResults",
-                            "Parameters": {
-                                "MaxResults": 10,
-                                "QueryExecutionId.$": "$.QueryExecution.QueryExecution.QueryExecutionId"
-                            },
-                            "Next": "Pass (1)"
-                        },
-                        "Pass (1)": {
-                            "Type": "Pass",
-                            "Next": "Choice (3)",
-                            "Parameters": {
-                                "ArrayLength.$": "States.ArrayLength($.ResultSet.Rows)"
-                            }
-                        },
-                        "Choice (3)": {
-                            "Type": "Choice",
-                            "Choices": [
-                                {
-                                    "Variable": "$.ArrayLength",
-                                    "NumericGreaterThan": 1,
-                                    "Next": "Fail"
-                                }
-                            ],
-                            "Default": "Success"
+                            "MaxConcurrency": column_group_concurrency,
+                            "ResultPath": None
                         },
-                        "Fail": {
+                        "Fail (1)": {
                             "Type": "Fail"
                         },
                         "Success": {
@@ -0,0 +1,53 @@
+import pytest
+
+from data_reconciliation.handler import handler
+from data_reconciliation.handler.handler import lambda_handler, build_column_groups
+
+
+def _rows(*columns):
+    rows = [{"Data": [{"VarCharValue": "column_name"}, {"VarCharValue": "is_pk"}]}]
+    for name, is_pk in columns:
+        rows.append({"Data": [{"VarCharValue": name}, {"VarCharValue": is_pk}]})
+    return {"QueryResult": {"ResultSet": {"Rows": rows}}}
+
+
+def test_narrow_table_is_compared_in_single_group():
+    result = lambda_handler(_rows(("ID", "1"), ("NAME", "0")), None)
+
+    assert result["column_groups"] == [{"columns": "ID,NAME"}]
+
+
+def test_wide_table_groups_include_primary_key():
+    groups = build_column_groups(["ID", "A", "B", "C"], ["ID"], 2)
+
+    assert groups == [{"columns": "ID,A,B"}, {"columns": "ID,C"}]
+
+
+def test_table_without_primary_key_is_not_split():
+    groups = build_column_groups(["A", "B", "C"], [], 1)
+
+    assert groups == [{"columns": "A,B,C"}]
+
+
+def test_remaining_pages_are_fetched(monkeypatch):
+    class FakeAthena:
+        def get_query_results(self, QueryExecutionId, NextToken, MaxResults):
+            assert (QueryExecutionId, NextToken) == ("query-id", "token")
+            return _rows(("B", "0"))["QueryResult"]
+
+    event = _rows(("ID", "1"), ("A", "0"))
+    event["QueryResult"]["NextToken"] = "token"
+    event["QueryExecutionId"] = "query-id"
+    monkeypatch.setattr(handler.boto3, "client", lambda service: FakeAthena())
+    monkeypatch.setenv("column_group_size", "1")
+
+    result = lambda_handler(event, None)
+
+    assert result["column_groups"] == [{"columns": "ID,A"}, {"columns": "ID,B"}]
+
+
+def test_invalid_column_group_size_is_rejected(monkeypatch):
+    monkeypatch.setenv("column_group_size", "0")
+
+    with pytest.raises(ValueError, match="column_group_size"):
+        lambda_handler(_rows(("ID", "1")), None)
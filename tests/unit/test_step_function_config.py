@@ -0,0 +1,48 @@
+import re
+
+import step_function_config
+
+
+def _definition():
+    return step_function_config.build_reconciliation_step_function(
+        "bucket", "prefix", "result-bucket", "lambda-arn", "crawler", "datasource", "catalog_db", 2
+    )
+
+
+def _table_states():
+    return _definition()["States"]["Map"]["ItemProcessor"]["States"]
+
+
+def _assert_format_arguments_match(expression):
+    match = re.fullmatch(r"States\.Format\('(.*)',(.*)\)", expression, re.S)
+    template, arguments = match.groups()
+    assert template.count("{}") == len(arguments.split(","))
+
+
+def test_column_lookup_format_arguments_match():
+    states = _table_states()
+
+    _assert_format_arguments_match(states["Athena StartQueryExecution"]["Parameters"]["QueryString.$"])
+
+
+def test_group_comparison_format_arguments_match():
+    group_states = _table_states()["Map (1)"]["ItemProcessor"]["States"]
+
+    _assert_format_arguments_match(group_states["Athena StartQueryExecution (1)"]["Parameters"]["QueryString.$"])
+
+
+def test_column_groups_are_iterated():
+    group_map = _table_states()["Map (1)"]
+
+    assert group_map["ItemsPath"] == "$.LambdaTaskResult.column_groups"
+    assert group_map["ItemSelector"]["Columns.$"] == "$$.Map.Item.Value.columns"
+    assert group_map["ItemProcessor"]["StartAt"] in group_map["ItemProcessor"]["States"]
+
+
+def test_failed_column_lookup_fails_table():
+    states = _table_states()
+
+    failed_choice = states["Choice (1)"]["Choices"][1]
+
+    assert {choice["StringEquals"] for choice in failed_choice["Or"]} == {"FAILED", "CANCELLED"}
+    assert states[failed_choice["Next"]]["Type"] == "Fail"